@@ -1,15 +1,163 @@
 import pytest
 import requests
+import vcr
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from jsonschema import Draft7Validator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-@pytest.fixture
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+CASSETTE_NAME = "jsonplaceholder.yaml"
+REQUESTS_CACHE_PATH = Path(__file__).parent / ".cache" / "test_cache.sqlite"
+# (connect, read) seconds, so a stalled socket fails the test instead of hanging the worker
+DEFAULT_TIMEOUT = (3.05, 5)
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests sent without one"""
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--use-requests-cache",
+        action="store_true",
+        default=False,
+        help="Replay GET responses from a local SQLite cache instead of the live API"
+    )
+    parser.addoption(
+        "--remote",
+        action="store_true",
+        default=False,
+        help="Run against the live API instead of replaying the cassette"
+    )
+    parser.addoption(
+        "--record-mode",
+        default="none",
+        choices=("once", "new_episodes", "none", "all"),
+        help="VCR record mode for the cassette used by local runs (recording requires -n 0)"
+    )
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="Also run tests marked slow"
+    )
+
+def pytest_configure(config):
+    # Each xdist worker would save only its own share of the interactions,
+    # overwriting the cassette written by the others
+    recording = config.getoption("--record-mode") != "none" and not config.getoption("--remote")
+    if recording and getattr(config.option, "numprocesses", None):
+        raise pytest.UsageError("Recording a cassette needs a single process, run with -n 0")
+    config.addinivalue_line("markers", "slow: test downloads a large payload (run with --run-slow)")
+
+def pytest_collection_modifyitems(config, items):
+    skip_slow = pytest.mark.skip(reason="needs --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords and not config.getoption("--run-slow"):
+            item.add_marker(skip_slow)
+
+@pytest.fixture(scope="session")
+def vcr_config():
+    """How recorded interactions are matched against outgoing requests"""
+    return {"match_on": ["method", "scheme", "host", "port", "path", "query", "body"]}
+
+@pytest.fixture(scope="session", autouse=True)
+def cassette(pytestconfig, vcr_config):
+    """Replay recorded HTTP interactions from the cassette instead of the live API"""
+    record_mode = pytestconfig.getoption("--record-mode")
+    if pytestconfig.getoption("--remote"):
+        yield None
+        return
+    if record_mode == "none" and not (CASSETTE_DIR / CASSETTE_NAME).exists():
+        warnings.warn(f"No cassette at {CASSETTE_DIR / CASSETTE_NAME}, running against the live API")
+        yield None
+        return
+    recorder = vcr.VCR(
+        cassette_library_dir=str(CASSETTE_DIR),
+        record_mode=record_mode,
+        **vcr_config
+    )
+    with recorder.use_cassette(CASSETTE_NAME) as recorded:
+        yield recorded
+
+@pytest.fixture(scope="session")
+def fan_out(cassette):
+    """Map a request function over its arguments concurrently, one by one while a cassette is active"""
+    def run(send, args):
+        args = list(args)
+        # vcrpy drops interactions recorded or replayed from several threads at once
+        if cassette is not None:
+            return [send(arg) for arg in args]
+        with ThreadPoolExecutor(max_workers=len(args)) as executor:
+            return list(executor.map(send, args))
+    return run
+
+@pytest.fixture(scope="session")
 def base_url():
     """Base URL for JSONPlaceholder API"""
     return "https://jsonplaceholder.typicode.com"
 
-@pytest.fixture
-def session():
-    """HTTP session for making requests"""
-    return requests.Session()
+@pytest.fixture(scope="session")
+def session(pytestconfig):
+    """HTTP session shared by the whole run so keep-alive connections are reused"""
+    if pytestconfig.getoption("--use-requests-cache"):
+        from requests_cache import CachedSession
+        s = CachedSession(
+            str(REQUESTS_CACHE_PATH),
+            backend="sqlite",
+            expire_after=43200,
+            allowable_methods=("GET",),
+            # The negative lookups expect 404s, cache them too so warm runs stay offline
+            allowable_codes=(200, 404)
+        )
+    else:
+        s = requests.Session()
+    # requests speaks HTTP/1.1 only, so every in-flight request of a concurrent
+    # fan-out needs its own connection; keep the pool larger than the widest one
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        # Retry dropped connections immediately, but hand every HTTP status
+        # (including the expected 500s) straight back to the test
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0,
+            status_forcelist=[],
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+    )
+    s.mount("https://", adapter)
+    s.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+    yield s
+    s.close()
+
+@pytest.fixture(scope="session")
+def send_get(base_url, session):
+    """Send a GET for a path, prepared once per path instead of on every Session.request call"""
+    @lru_cache(maxsize=None)
+    def prepare(path):
+        prepared = session.prepare_request(requests.Request("GET", f"{base_url}{path}"))
+        # Session.send skips Session.request's environment merge, so pick up
+        # REQUESTS_CA_BUNDLE / CURL_CA_BUNDLE, proxies etc. here like other requests do
+        settings = session.merge_environment_settings(prepared.url, {}, None, None, None)
+        return prepared, settings
+
+    def send(path):
+        prepared, settings = prepare(path)
+        return session.send(prepared, **settings)
+    return send
 
 @pytest.fixture
 def valid_post_data():
@@ -20,12 +168,45 @@ def valid_post_data():
         "userId": 1
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def expected_post_keys():
     """Expected keys in a post response"""
-    return {"userId", "id", "title", "body"}
+    return frozenset({"userId", "id", "title", "body"})
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def expected_user_keys():
     """Expected keys in a user response"""
-    return {"id", "name", "username", "email", "address", "phone", "website", "company"}
\ No newline at end of file
+    return frozenset({"id", "name", "username", "email", "address", "phone", "website", "company"})
+
+@pytest.fixture(scope="session")
+def post_validator(expected_post_keys):
+    """Compiled JSON schema for a single post"""
+    return Draft7Validator({
+        "type": "object",
+        "required": sorted(expected_post_keys),
+        "properties": {
+            "userId": {"type": "integer"},
+            "id": {"type": "integer"},
+            "title": {"type": "string"},
+            "body": {"type": "string"}
+        }
+    })
+
+@pytest.fixture(scope="session")
+def user_validator(expected_user_keys):
+    """Compiled JSON schema for a single user"""
+    return Draft7Validator({
+        "type": "object",
+        "required": sorted(expected_user_keys),
+        "properties": {
+            "id": {"type": "integer"},
+            "name": {"type": "string"},
+            "username": {"type": "string"},
+            "email": {"type": "string"},
+            "address": {
+                "type": "object",
+                "required": ["street", "suite", "city", "zipcode", "geo"]
+            },
+            "company": {"type": "object"}
+        }
+    })